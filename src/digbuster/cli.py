@@ -21,9 +21,9 @@ def main():
         print(f"  gotify    : url={'set' if cfg['notification']['gotify_url'] else 'missing'}, token={'set' if cfg['notification']['gotify_token'] else 'missing'}")
 
     print("[digbuster] domains OK")
-    print(f"  contains  : {len(dom['contains'])}")
-    print(f"  exact     : {len(dom['exact'])}")
-    print(f"  wildcards : {len(dom['wildcards'])}")
+    print(f"  contains  : {len(dom.contains)}")
+    print(f"  exact     : {len(dom.exact)}")
+    print(f"  wildcards : {len(dom.wildcards)}")
 
 if __name__ == "__main__":
     main()
@@ -1,33 +1,87 @@
 # src/digbuster/config.py
-from configparser import ConfigParser
+import re
+from typing import Dict
 
 class ConfigError(Exception):
     pass
 
+_SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*$")
+_KV_RE = re.compile(r"^([A-Za-z_][\w.-]*)\s*[=:]\s*(.*)$")
+
+# Same spellings ConfigParser.getboolean() accepts.
+_BOOLEAN_STATES = {
+    "1": True, "yes": True, "true": True, "on": True,
+    "0": False, "no": False, "false": False, "off": False,
+}
+
+def _parse_ini(text: str) -> Dict[str, Dict[str, str]]:
+    """
+    Minimal INI parser: [section] headers, key = value (or key: value) pairs,
+    and full-line # / ; comments. Keys are lowercased like ConfigParser does.
+    """
+    sections: Dict[str, Dict[str, str]] = {}
+    current = None
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        m = _SECTION_RE.match(line)
+        if m:
+            current = sections.setdefault(m.group(1).strip(), {})
+            continue
+        m = _KV_RE.match(line)
+        if m is None:
+            raise ConfigError(f"line {lineno}: cannot parse: {line}")
+        if current is None:
+            raise ConfigError(f"line {lineno}: key outside of any section: {line}")
+        current[m.group(1).lower()] = m.group(2).strip()
+    return sections
+
+def _get_int(section: Dict[str, str], name: str, key: str, fallback: int) -> int:
+    value = section.get(key, "")
+    if not value:
+        return fallback
+    try:
+        return int(value)
+    except ValueError:
+        raise ConfigError(f"[{name}].{key} must be an integer, got: {value}")
+
+def _get_bool(section: Dict[str, str], name: str, key: str, fallback: bool) -> bool:
+    value = section.get(key, "")
+    if not value:
+        return fallback
+    try:
+        return _BOOLEAN_STATES[value.lower()]
+    except KeyError:
+        raise ConfigError(f"[{name}].{key} must be a boolean, got: {value}")
+
 def load_config(path: str) -> dict:
     """
     Load and validate DigBuster configuration from an INI-style file.
     """
-    cp = ConfigParser()
-    read = cp.read(path)
-    if not read:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sections = _parse_ini(f.read())
+    except OSError:
         raise ConfigError(f"config file not found or unreadable: {path}")
 
-    if not cp.has_section("general"):
+    general = sections.get("general")
+    if general is None:
         raise ConfigError("missing [general] section")
-    if not cp.has_section("notification"):
+    notification = sections.get("notification")
+    if notification is None:
         raise ConfigError("missing [notification] section")
 
-    dns_log_file = cp.get("general", "dns_log_file", fallback="").strip()
+    dns_log_file = general.get("dns_log_file", "")
     if not dns_log_file:
         raise ConfigError("[general].dns_log_file must be set")
 
-    cooldown = cp.getint("general", "cooldown_seconds", fallback=60)
+    cooldown = _get_int(general, "general", "cooldown_seconds", 60)
     if cooldown < 0:
         raise ConfigError("[general].cooldown_seconds must be >= 0")
 
-    enabled = cp.getboolean("notification", "enabled", fallback=False)
-    ntype = cp.get("notification", "type", fallback="").strip().lower()
+    enabled = _get_bool(notification, "notification", "enabled", False)
+    ntype = notification.get("type", "").lower()
     if enabled and ntype not in {"pushover", "gotify"}:
         raise ConfigError('[notification].type must be "pushover" or "gotify" when enabled=true')
 
@@ -39,10 +93,10 @@ def load_config(path: str) -> dict:
         "notification": {
             "enabled": enabled,
             "type": ntype,  # "" if disabled
-            "pushover_user": cp.get("notification", "pushover_user", fallback="").strip(),
-            "pushover_token": cp.get("notification", "pushover_token", fallback="").strip(),
-            "gotify_url": cp.get("notification", "gotify_url", fallback="").strip(),
-            "gotify_token": cp.get("notification", "gotify_token", fallback="").strip(),
+            "pushover_user": notification.get("pushover_user", ""),
+            "pushover_token": notification.get("pushover_token", ""),
+            "gotify_url": notification.get("gotify_url", ""),
+            "gotify_token": notification.get("gotify_token", ""),
         },
     }
     return cfg
@@ -1,18 +1,90 @@
-import re
-from typing import Dict, Set
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Set, Tuple
+
+try:
+    import ahocorasick  # optional: pyahocorasick
+except ImportError:
+    ahocorasick = None
 
 class DomainsError(Exception):
     pass
 
-_LABEL_RE = re.compile(r"^[a-z0-9_-]{1,63}$", re.I)
+@dataclass(frozen=True, slots=True, eq=False)
+class Rules:
+    """
+    Compiled, immutable view of domains.cfg as returned by load_domains().
+    Slots keep attribute access cheap on the per-FQDN hot path.
+    """
+    contains: FrozenSet[str] = frozenset()
+    exact: FrozenSet[str] = frozenset()
+    wildcards: FrozenSet[str] = frozenset()
+    contains_ac: Any = None          # Aho-Corasick automaton or None
+    contains_by_len: Tuple[str, ...] = ()  # fallback scan order, shortest first
+    wildcard_trie: Dict[str, Any] = field(default_factory=dict)
+
+_NAME_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_."
+# translate() table: allowed name bytes -> 0x00, everything else -> 0x01.
+_INVALID_TABLE = bytes(0 if chr(c) in _NAME_CHARS else 1 for c in range(256))
 
 def _valid_fqdn(name: str) -> bool:
     parts = name.split(".")
     if len(parts) < 2:
         return False
-    return all(_LABEL_RE.match(p) for p in parts)
+    if not all(1 <= len(p) <= 63 for p in parts):
+        return False
+    # One translate + memchr instead of a regex match per label.
+    return b"\x01" not in name.encode("ascii", errors="replace").translate(_INVALID_TABLE)
+
+_TRIE_END = "$"
+
+def _build_wildcard_trie(wildcards: Set[str]) -> Dict[str, Any]:
+    """
+    Build a suffix trie over reversed labels, e.g. "example.com" ->
+    {"com": {"example": {"$": "example.com"}}}.
+    """
+    trie: Dict[str, Any] = {}
+    for base in wildcards:
+        node = trie
+        for label in reversed(base.split(".")):
+            node = node.setdefault(label, {})
+        node[_TRIE_END] = base
+    return trie
+
+def _match_wildcard(name: str, trie: Dict[str, Any]) -> str | None:
+    """
+    Return the wildcard base that `name` is a strict subdomain of, or None.
+    Walks labels right-to-left, so cost is O(labels) regardless of rule count.
+    """
+    labels = name.split(".")
+    node = trie
+    for i in range(len(labels) - 1, 0, -1):
+        node = node.get(labels[i])
+        if node is None:
+            return None
+        base = node.get(_TRIE_END)
+        if base is not None:
+            return base
+    return None
 
-def load_domains(path: str) -> Dict[str, Set[str]]:
+def _build_contains_automaton(contains: Set[str]):
+    """
+    Build an Aho-Corasick automaton over the [contains] tokens so every token
+    can be found in a single pass over a name. Returns None when pyahocorasick
+    is not installed or there is nothing to match.
+    """
+    if ahocorasick is None:
+        return None
+    tokens = [tok for tok in contains if tok]
+    if not tokens:
+        return None
+    automaton = ahocorasick.Automaton()
+    for tok in tokens:
+        automaton.add_word(tok, tok)
+    automaton.make_automaton()
+    return automaton
+
+def load_domains(path: str) -> Rules:
     contains: Set[str] = set()
     exact: Set[str] = set()
     wildcards: Set[str] = set()
@@ -48,36 +120,93 @@ def load_domains(path: str) -> Dict[str, Set[str]]:
     except FileNotFoundError:
         raise DomainsError(f"domains file not found: {path}")
 
-    return {"contains": contains, "exact": exact, "wildcards": wildcards}
+    return Rules(
+        contains=frozenset(contains),
+        exact=frozenset(exact),
+        wildcards=frozenset(wildcards),
+        contains_ac=_build_contains_automaton(contains),
+        contains_by_len=tuple(sorted((tok for tok in contains if tok), key=lambda t: (len(t), t))),
+        wildcard_trie=_build_wildcard_trie(wildcards),
+    )
 
 
-def classify_fqdn(fqdn: str, rules: dict) -> dict:
+def _scan_contains(text: str, tokens_by_len: Tuple[str, ...], first_only: bool = False) -> list:
+    """
+    Substring scan used when pyahocorasick is not installed. Tokens are
+    sorted by length, so the scan stops at the first token longer than text.
+    """
+    hits = []
+    n = len(text)
+    for tok in tokens_by_len:
+        if len(tok) > n:
+            break
+        if tok in text:
+            hits.append(tok)
+            if first_only:
+                break
+    return hits
+
+
+def line_may_match(line: str, rules: Rules) -> bool:
+    """
+    Cheap whole-line gate to run before FQDN extraction.
+
+    Every extracted FQDN is a substring of the line, so when there are no
+    [exact] rules and no [contains] token occurs anywhere in the line,
+    nothing in it can match. `line` must already be lowercase.
+    """
+    if rules.exact or rules.wildcards:
+        return True
+    automaton = rules.contains_ac
+    if automaton is not None:
+        return next(automaton.iter(line), None) is not None
+    return bool(_scan_contains(line, rules.contains_by_len, first_only=True))
+
+
+def classify_fqdn(fqdn: str, rules: Rules, normalized: bool = False) -> dict:
     """
     Return a structured match result for a fully-qualified domain name.
 
     rules: output of load_domains()
+    normalized: set when fqdn is already lowercase with no surrounding
+                whitespace or dots (e.g. straight from extract_fqdns())
     -> {
          "hit": bool,
-         "contains": set[str],   # which [contains] tokens matched (may be many)
-         "exact": bool,          # True if exact FQDN matched in [exact]
-         "wildcard": str | None  # base like "example.com" if matched a *.example.com rule
+         "contains": frozenset[str],  # which [contains] tokens matched (may be many)
+         "exact": bool,               # True if exact FQDN matched in [exact]
+         "wildcard": str | None       # base like "example.com" if matched a *.example.com rule
        }
+
+    Results are cached per (name, rules) and shared between callers, so
+    treat the returned dict as read-only.
     """
-    name = fqdn.lower().strip().strip(".")
-    contains_hits = {tok for tok in rules["contains"] if tok and tok in name}
+    name = fqdn if normalized else fqdn.lower().strip().strip(".")
+    return _classify_cached(name, rules)
+
+
+def clear_classify_cache() -> None:
+    """Drop cached classify_fqdn() results, e.g. after the rules are reloaded."""
+    _classify_cached.cache_clear()
 
-    exact_hit = name in rules["exact"]
+
+# DNS traffic is heavily skewed towards a few names, so most lookups repeat.
+@lru_cache(maxsize=16384)
+def _classify_cached(name: str, rules: Rules) -> dict:
+    automaton = rules.contains_ac
+    if automaton is not None:
+        contains_hits = frozenset(tok for _, tok in automaton.iter(name))
+    else:
+        contains_hits = frozenset(_scan_contains(name, rules.contains_by_len))
+
+    exact_hit = name in rules.exact
 
     wildcard_base = None
     if not exact_hit:
-        for base in rules["wildcards"]:
-            if name.endswith("." + base):
-                wildcard_base = base
-                break
+        wildcard_base = _match_wildcard(name, rules.wildcard_trie)
 
     return {
         "hit": bool(contains_hits or exact_hit or wildcard_base),
         "contains": contains_hits,
         "exact": exact_hit,
         "wildcard": wildcard_base,
-    }
\ No newline at end of file
+    }
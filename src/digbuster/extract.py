@@ -1,13 +1,108 @@
-import re
-from typing import Set
+from typing import Dict, Set
 
-_DOMAIN_RE = re.compile(r'(?i)\b([a-z0-9_-]{1,63}(?:\.[a-z0-9_-]{1,63})+)\b')
+try:
+    import re2 as re  # optional: google-re2, linear-time and no backtracking
+except ImportError:
+    import re
 
-def extract_fqdns(line: str) -> Set[str]:
+try:
+    import hyperscan  # optional: python-hyperscan
+except ImportError:
+    hyperscan = None
+
+# Patterns are lowercase-only: callers lowercase the line once via lower_line().
+# On bytes, \b is ASCII-only, so matches that touch a non-ASCII byte are
+# rejected afterwards (see _ascii_bounded()).
+_DOMAIN_RE = re.compile(rb'\b([a-z0-9_-]{1,63}(?:\.[a-z0-9_-]{1,63})+)\b')
+
+# Hyperscan cannot track start-of-match for the bounded {1,63} repeats
+# ("Pattern is too large"), so the label length limit is enforced after the scan.
+_HS_PATTERN = rb'\b[a-z0-9_-]+(?:\.[a-z0-9_-]+)+\b'
+_MAX_LABEL = 63
+
+_LOWER_TABLE = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+
+
+def _compile_hs_db():
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    try:
+        db.compile(
+            expressions=[_HS_PATTERN],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST],
+        )
+    except hyperscan.error:
+        return None
+    return db
+
+
+_HS_DB = _compile_hs_db()
+
+
+def _on_hs_match(_id, start, end, _flags, spans: Dict[int, int]):
+    # Matches arrive in order of end offset; keep the longest end per start.
+    spans[start] = end
+
+
+def _ascii_bounded(data: bytes, start: int, end: int) -> bool:
+    """
+    False if the span touches a byte >= 0x80, i.e. it is only the ASCII
+    tail or head of a UTF-8 word ("nchen.de" out of "münchen.de").
+    """
+    return (start == 0 or data[start - 1] < 0x80) and (end >= len(data) or data[end] < 0x80)
+
+
+def _extract_re(data: bytes) -> Set[str]:
+    return {
+        m.group(1).decode("ascii").strip(".")
+        for m in _DOMAIN_RE.finditer(data)
+        if _ascii_bounded(data, m.start(1), m.end(1))
+    }
+
+
+def _extract_hs(data: bytes) -> Set[str]:
+    spans: Dict[int, int] = {}
+    _HS_DB.scan(data, match_event_handler=_on_hs_match, context=spans)
+
+    out: Set[str] = set()
+    last_end = -1
+    for start in sorted(spans):
+        # Hyperscan reports every prefix match; keep only leftmost-longest,
+        # non-overlapping spans to mirror re.finditer().
+        if start < last_end:
+            continue
+        end = spans[start]
+        last_end = end
+        fq = data[start:end]
+        if any(len(label) > _MAX_LABEL for label in fq.split(b".")):
+            # With a label over 63 chars, re backtracks to a shorter match and
+            # may then start new matches inside this span, which Hyperscan's
+            # leftmost start-of-match never reports. Such lines are rare, so
+            # let the regex handle the whole line.
+            return _extract_re(data)
+        if _ascii_bounded(data, start, end):
+            out.add(fq.decode("ascii").strip("."))
+    return out
+
+
+def lower_line(line: bytes) -> bytes:
+    """
+    Lowercase the ASCII letters of a raw log line in one pass.
+    Other bytes (including UTF-8 sequences) are left as they are.
+    """
+    return line.translate(_LOWER_TABLE)
+
+
+def extract_fqdns(line: bytes) -> Set[str]:
     """
     Return a set of candidate FQDNs found in a log line.
-    Trailing dots are stripped; output is lowercase.
+    `line` must be raw bytes already lowercased with lower_line().
+    Trailing dots are stripped.
     """
     if not line:
         return set()
-    return {m.group(1).lower().strip(".") for m in _DOMAIN_RE.finditer(line)}
+    if _HS_DB is not None:
+        return _extract_hs(line)
+    return _extract_re(line)
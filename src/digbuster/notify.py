@@ -5,39 +5,200 @@ Supports:
 - Pushover
 - Gotify
 
-Uses Python's standard library (urllib) to avoid extra dependencies.
+Uses Python's standard library (http.client) to avoid extra dependencies.
+Connections are kept alive and reused, so bursts of alerts do not pay a
+TCP + TLS handshake per message. The address a host resolved to is pinned
+and reused on reconnect; DNS is only asked again when that address fails.
+HTTP_PROXY / HTTPS_PROXY / NO_PROXY are honoured the same way urllib does.
 """
 
 from typing import Tuple, Dict, Any
-from urllib import request, parse, error
+from urllib import parse, request
+import base64
+import http.client
 import json
+import socket
+import ssl
+import threading
 
 
 class NotifyError(Exception):
     """Raised when a notification cannot be delivered."""
 
 
+# (scheme, host, port, proxy url or None) -> open keep-alive connection
+_CONNECTIONS: Dict[Tuple[str, str, int | None, str | None], http.client.HTTPConnection] = {}
+# (host, port) -> (ip, port) that last connected successfully
+_RESOLVED: Dict[Tuple[str, int], Tuple[str, int]] = {}
+# http.client connections are not thread-safe; serialize all requests.
+_LOCK = threading.Lock()
+
+
+def _connect_pinned(host: str, port: int, timeout: float, source_address=None) -> socket.socket:
+    """
+    socket.create_connection() that reuses the last working address for a
+    host, so reconnects do not need a DNS lookup. Matters when the resolver
+    being watched is also the one this host uses.
+    """
+    address = (host, port)
+    pinned = _RESOLVED.get(address)
+    if pinned is not None:
+        try:
+            return socket.create_connection(pinned, timeout, source_address)
+        except OSError:
+            _RESOLVED.pop(address, None)
+    sock = socket.create_connection(address, timeout, source_address)
+    _RESOLVED[address] = sock.getpeername()[:2]
+    return sock
+
+
+def _set_nodelay(sock: socket.socket) -> None:
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection whose TCP connect goes to the pinned address of its host."""
+
+    def connect(self):
+        self.sock = _connect_pinned(self.host, self.port, self.timeout, self.source_address)
+        _set_nodelay(self.sock)
+
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """
+    HTTPSConnection whose TCP connect goes to the pinned address; TLS
+    verification and SNI still use the configured hostname.
+    """
+
+    def __init__(self, host: str, port: int | None = None, *, timeout: float):
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.set_alpn_protocols(["http/1.1"])
+        super().__init__(host, port, timeout=timeout, context=self.ssl_context)
+
+    def connect(self):
+        sock = _connect_pinned(self.host, self.port, self.timeout, self.source_address)
+        _set_nodelay(sock)
+        try:
+            self.sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host)
+        except Exception:
+            sock.close()
+            raise
+
+
+def _proxy_for(scheme: str, host: str) -> str | None:
+    """Proxy URL urllib would use for this request (from the environment), or None."""
+    proxy = request.getproxies().get(scheme)
+    if not proxy or request.proxy_bypass(host):
+        return None
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _proxy_auth(proxy: str) -> Dict[str, str]:
+    """Proxy-Authorization header for credentials embedded in the proxy URL."""
+    pparts = parse.urlsplit(proxy)
+    if not pparts.username:
+        return {}
+    creds = f"{parse.unquote(pparts.username)}:{parse.unquote(pparts.password or '')}"
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(creds.encode("utf-8")).decode("ascii")}
+
+
+def _get_conn(key: Tuple[str, str, int | None, str | None], timeout: int) -> http.client.HTTPConnection:
+    conn = _CONNECTIONS.get(key)
+    if conn is None:
+        scheme, host, port, proxy = key
+        if proxy is None:
+            cls = _PinnedHTTPSConnection if scheme == "https" else _PinnedHTTPConnection
+            conn = cls(host, port, timeout=timeout)
+        else:
+            # The proxy resolves the real host, so there is nothing to pin.
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            pparts = parse.urlsplit(proxy)
+            conn = cls(pparts.hostname, pparts.port or 80, timeout=timeout)
+            if scheme == "https":
+                # CONNECT through the proxy; TLS and SNI are for the real host.
+                conn.set_tunnel(host, port, headers=_proxy_auth(proxy))
+        _CONNECTIONS[key] = conn
+    else:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_conn(key: Tuple[str, str, int | None, str | None], unpin: bool = False) -> None:
+    """
+    Close and forget the cached connection. With unpin=True also forget the
+    pinned address, so the next connect resolves the host again; a pinned IP
+    can keep accepting TCP long after the service moved away from it.
+    """
+    conn = _CONNECTIONS.pop(key, None)
+    if conn is not None:
+        conn.close()
+        if unpin:
+            _RESOLVED.pop((conn.host, conn.port), None)
+
+
+def _http_post(url: str, payload: bytes, content_type: str, headers: Dict[str, str] | None, timeout: int) -> Tuple[int, str]:
+    """
+    POST payload over a pooled keep-alive connection.
+    Returns (status_code, response_text[:500])
+    """
+    parts = parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise NotifyError(f"unsupported url: {url}")
+    try:
+        port = parts.port
+        proxy = _proxy_for(parts.scheme, parts.hostname)
+    except ValueError as e:
+        raise NotifyError(str(e))
+    key = (parts.scheme, parts.hostname, port, proxy)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    hdrs = {"Content-Type": content_type}
+    if proxy is not None and parts.scheme == "http":
+        # Plain HTTP proxies take the absolute URL in the request line.
+        path = parse.urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+        hdrs.update(_proxy_auth(proxy))
+    if headers:
+        hdrs.update(headers)
+
+    with _LOCK:
+        retried = False
+        while True:
+            conn = _get_conn(key, timeout)
+            try:
+                conn.request("POST", path, body=payload, headers=hdrs)
+                resp = conn.getresponse()
+                # Read the whole body so the connection can be reused.
+                body = resp.read().decode("utf-8", errors="replace")
+                if resp.status >= 500:
+                    # Possibly a stale address answering; resolve again next time.
+                    _drop_conn(key, unpin=True)
+                return resp.status, body[:500]
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                # The server closed an idle keep-alive connection; retry once on a fresh one.
+                if retried:
+                    _drop_conn(key, unpin=True)
+                    raise NotifyError(str(e))
+                _drop_conn(key)
+                retried = True
+            except Exception as e:
+                _drop_conn(key, unpin=True)
+                raise NotifyError(str(e))
+
+
 def _http_post_form(url: str, data: Dict[str, Any], headers: Dict[str, str] | None = None, timeout: int = 10) -> Tuple[int, str]:
     """
     POST application/x-www-form-urlencoded
     Returns (status_code, response_text[:500])
     """
     payload = parse.urlencode(data).encode("utf-8")
-    req = request.Request(url, data=payload, method="POST")
-    req.add_header("Content-Type", "application/x-www-form-urlencoded")
-    if headers:
-        for k, v in headers.items():
-            req.add_header(k, v)
-
-    try:
-        with request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8", errors="replace")
-            return resp.getcode(), body[:500]
-    except error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace") if e.fp else str(e)
-        return e.code, body[:500]
-    except Exception as e:
-        raise NotifyError(str(e))
+    return _http_post(url, payload, "application/x-www-form-urlencoded", headers, timeout)
 
 
 def _http_post_json(url: str, data: Dict[str, Any], headers: Dict[str, str] | None = None, timeout: int = 10) -> Tuple[int, str]:
@@ -46,21 +207,7 @@ def _http_post_json(url: str, data: Dict[str, Any], headers: Dict[str, str] | No
     Returns (status_code, response_text[:500])
     """
     payload = json.dumps(data).encode("utf-8")
-    req = request.Request(url, data=payload, method="POST")
-    req.add_header("Content-Type", "application/json")
-    if headers:
-        for k, v in headers.items():
-            req.add_header(k, v)
-
-    try:
-        with request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8", errors="replace")
-            return resp.getcode(), body[:500]
-    except error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace") if e.fp else str(e)
-        return e.code, body[:500]
-    except Exception as e:
-        raise NotifyError(str(e))
+    return _http_post(url, payload, "application/json", headers, timeout)
 
 
 def send_pushover(ncfg: Dict[str, Any], title: str, message: str, priority: int = 0) -> Tuple[bool, str]:
@@ -1,56 +1,343 @@
 import os
+import queue
+import sys
+import threading
 import time
-from pathlib import Path
+from collections import OrderedDict
 
 from .config import load_config, ConfigError
-from .domains import load_domains, DomainsError, classify_fqdn
-from .extract import extract_fqdns
-from .notify import send_notification
+from .domains import (
+    load_domains,
+    DomainsError,
+    Rules,
+    classify_fqdn,
+    clear_classify_cache,
+    line_may_match,
+)
+from .extract import extract_fqdns, lower_line
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags  # optional, Linux only
+
+    # Events that mean a watched name now points at a different file.
+    _INOTIFY_REPLACED = (
+        inotify_flags.CREATE | inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM | inotify_flags.DELETE
+    )
+    _INOTIFY_MASK = _INOTIFY_REPLACED | inotify_flags.MODIFY | inotify_flags.CLOSE_WRITE
+except (ImportError, OSError):
+    INotify = None
 
 DEFAULT_CONFIG = "config.cfg"
 DEFAULT_DOMAINS = "domains.cfg"
 
+_INOTIFY_SAFETY_MS = 5000
+_INOTIFY_DELAY_MS = 50
+
+# Bytes requested per os.read() while tailing.
+_READ_SIZE = 65536
+
+# Upper bound on FQDNs tracked for cooldown; the oldest are evicted first.
+_LAST_SEEN_MAX = 65536
+
+# Alerts waiting for the notify thread; further alerts are dropped when full.
+_NOTIFY_QUEUE_SIZE = 1024
+
 
-def _tail_f(path: str):
+class _LogReader:
     """
-    Tail a file forever (like `tail -F`), surviving log rotation.
-    Yields new lines as they appear.
+    Tails a file through a raw fd, positioned at EOF on open.
+    Reads in large blocks and splits them into lines itself; an incomplete
+    last line is held back until the rest of it arrives.
     """
+
+    __slots__ = ("fd", "inode", "_partial")
+
+    def __init__(self, path: str):
+        self.fd = os.open(path, os.O_RDONLY)
+        try:
+            os.lseek(self.fd, 0, os.SEEK_END)
+            self.inode = os.fstat(self.fd).st_ino
+        except OSError:
+            os.close(self.fd)
+            raise
+        self._partial = b""
+
+    def drain(self, final: bool = False):
+        """
+        Yield every complete line (bytes, without the newline) readable now.
+        With final=True, also yield a trailing unterminated line.
+        """
+        while True:
+            chunk = os.read(self.fd, _READ_SIZE)
+            if not chunk:
+                break
+            lines = (self._partial + chunk).split(b"\n")
+            self._partial = lines.pop()
+            yield from lines
+        if final and self._partial:
+            rest, self._partial = self._partial, b""
+            yield rest
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _rotated(path: str, inode: int) -> bool:
+    try:
+        return os.stat(path).st_ino != inode
+    except FileNotFoundError:
+        return False
+
+
+def _tail_poll(path: str):
+    """Polling tail: check for new data every 0.2s."""
     while True:
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(0, os.SEEK_END)
-                current_inode = os.fstat(f.fileno()).st_ino
+            reader = _LogReader(path)
+        except FileNotFoundError:
+            time.sleep(0.5)
+            continue
+
+        try:
+            while True:
+                yield from reader.drain()
+                if _rotated(path, reader.inode):
+                    yield from reader.drain(final=True)
+                    break
+                time.sleep(0.2)
+        finally:
+            reader.close()
+
+
+def _watch_names(path: str) -> set:
+    """
+    Paths whose directory events concern `path`: the name itself and, if it
+    is a symlink, the file it resolves to. Writes to a symlinked log only
+    raise events in the target's directory, while replacing the symlink
+    shows up in the link's own directory.
+    """
+    return {os.path.abspath(path), os.path.realpath(path)}
+
+
+def _add_watches(ino, dirs, paths) -> None:
+    """Watch the parent directory of every name in _watch_names() of paths."""
+    for p in paths:
+        for name in _watch_names(p):
+            d = os.path.dirname(name)
+            if d not in dirs.values():
+                dirs[ino.add_watch(d, _INOTIFY_MASK)] = d
 
-                while True:
-                    line = f.readline()
-                    if line:
-                        yield line
-                        continue
 
+def _open_inotify(paths):
+    """
+    Set up inotify watches on the parent directory of each path.
+    Returns (INotify, {wd: directory}) or None if inotify is unavailable.
+    """
+    if INotify is None:
+        return None
+    try:
+        ino = INotify()
+    except OSError:
+        return None
+    dirs = {}
+    try:
+        _add_watches(ino, dirs, paths)
+    except OSError:
+        ino.close()
+        return None
+    return ino, dirs
+
+
+def _tail_inotify(ino, dirs, path: str, also_watch):
+    """
+    Event-driven tail: sleep in inotify until the log's directory changes.
+    Yields None whenever one of `also_watch` is written or replaced.
+    """
+    log_names = _watch_names(path)
+    extra = set()
+    for p in also_watch:
+        extra |= _watch_names(p)
+    reader = None
+    try:
+        while True:
+            if reader is None:
+                try:
+                    reader = _LogReader(path)
+                except FileNotFoundError:
+                    reader = None
+                else:
+                    # After rotation a symlink may point somewhere new.
+                    log_names = _watch_names(path)
                     try:
-                        st = os.stat(path)
-                        if st.st_ino != current_inode:
-                            break
-                    except FileNotFoundError:
+                        _add_watches(ino, dirs, (path,))
+                    except OSError:
                         pass
+            if reader is not None:
+                yield from reader.drain()
 
-                    time.sleep(0.2)
+            reopen = False
+            touched = False
+            # The timeout is only a safety net for missed or overflowed events.
+            for ev in ino.read(timeout=_INOTIFY_SAFETY_MS, read_delay=_INOTIFY_DELAY_MS):
+                name = os.path.join(dirs.get(ev.wd, ""), ev.name)
+                if name in log_names:
+                    if ev.mask & _INOTIFY_REPLACED:
+                        reopen = True
+                elif name in extra and ev.mask & (_INOTIFY_REPLACED | inotify_flags.CLOSE_WRITE):
+                    touched = True
 
-        except FileNotFoundError:
-            time.sleep(0.5)
+            if reader is not None and (reopen or _rotated(path, reader.inode)):
+                yield from reader.drain(final=True)
+                reader.close()
+                reader = None
+            if touched:
+                yield None
+    finally:
+        if reader is not None:
+            reader.close()
+        ino.close()
+
+
+def _tail_f(path: str, also_watch=()):
+    """
+    Tail a file forever (like `tail -F`), surviving log rotation.
+    Yields new lines as they appear, as raw bytes without the newline.
+
+    Uses inotify when inotify_simple is installed, otherwise polls. With
+    inotify, None is also yielded when a file in `also_watch` changes.
+    """
+    watch = _open_inotify((path, *also_watch))
+    if watch is None:
+        yield from _tail_poll(path)
+    else:
+        yield from _tail_inotify(*watch, path, also_watch)
+
+
+def _file_sig(path: str):
+    """Return (mtime_ns, size) for path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 def _load_rules(domains_path: str):
-    """Load domains rules, returning (rules_dict, mtime or 0)."""
+    """Load domains rules, returning (Rules, file signature or None)."""
     try:
-        p = Path(domains_path)
         rules = load_domains(domains_path)
-        mtime = p.stat().st_mtime if p.exists() else 0
-        return rules, mtime
+        return rules, _file_sig(domains_path)
     except DomainsError as e:
         print(f"[digbuster] domains load error: {e}")
-        return {"contains": set(), "exact": set(), "wildcards": set()}, 0
+        return Rules(), None
+
+
+def _prune_last_seen(last_seen: OrderedDict, now: float, cooldown: int) -> None:
+    """
+    Drop entries whose cooldown has expired and cap the size.
+    last_seen is kept in timestamp order, so both happen from the front.
+    """
+    while last_seen:
+        _, ts = next(iter(last_seen.items()))
+        if now - ts < cooldown and len(last_seen) <= _LAST_SEEN_MAX:
+            break
+        last_seen.popitem(last=False)
+
+
+def _describe(res: dict) -> str:
+    """Render a classify_fqdn() result as e.g. "exact|contains:foo"."""
+    reasons = []
+    if res["exact"]:
+        reasons.append("exact")
+    if res["wildcard"]:
+        reasons.append(f"wildcard(*.{res['wildcard']})")
+    if res["contains"]:
+        reasons.append("contains:" + ",".join(sorted(res["contains"])))
+    return "|".join(reasons) if reasons else "match"
+
+
+class _Matcher:
+    """
+    Per-line matching: lowercase, prefilter, extract, cooldown and classify.
+    Kept free of I/O so the whole hot path is one method call over slotted
+    state, and a natural unit to port to a compiled extension.
+    """
+
+    __slots__ = ("rules", "cooldown", "last_seen", "has_contains", "has_names")
+
+    def __init__(self, rules: Rules, cooldown: int):
+        self.cooldown = cooldown
+        self.last_seen = OrderedDict()
+        self._use(rules)
+
+    def _use(self, rules: Rules) -> None:
+        self.rules = rules
+        self.has_contains = bool(rules.contains_by_len)
+        self.has_names = bool(rules.exact or rules.wildcards)
+
+    def set_rules(self, rules: Rules) -> None:
+        self._use(rules)
+        clear_classify_cache()
+
+    def process_line(self, raw: bytes, now: float) -> list:
+        """Return [(fqdn, reason), ...] for new matches in a raw log line."""
+        # Every FQDN candidate contains a dot; stats lines and banners usually don't.
+        if b"." not in raw:
+            return []
+
+        rules = self.rules
+        lbytes = lower_line(raw)
+        if not self.has_names:
+            if not self.has_contains:
+                return []
+            # latin-1 maps every byte to one char, so this decode cannot fail.
+            if not line_may_match(lbytes.decode("latin-1"), rules):
+                return []
+
+        fqdns = extract_fqdns(lbytes)
+        if not fqdns:
+            return []
+
+        last_seen = self.last_seen
+        cooldown = self.cooldown
+        matches = []
+        for fq in fqdns:
+            prev = last_seen.get(fq, 0.0)
+            if now - prev < cooldown:
+                continue
+
+            res = classify_fqdn(fq, rules, normalized=True)
+            if not res["hit"]:
+                continue
+
+            last_seen[fq] = now
+            last_seen.move_to_end(fq)
+            _prune_last_seen(last_seen, now, cooldown)
+            matches.append((fq, _describe(res)))
+        return matches
+
+
+def _notify_worker(q: queue.Queue, send_notification) -> None:
+    """Deliver queued alerts so slow HTTP round-trips never stall the tailer."""
+    while True:
+        cfg, title, msg = q.get()
+        try:
+            ok, status = send_notification(cfg, title, msg, priority=0)
+        except Exception as e:
+            ok, status = False, str(e)
+        if not ok and status not in ("disabled",):
+            sys.stdout.write(f"[digbuster] notify error: {status}\n")
+
+
+def _start_notifier() -> queue.Queue:
+    # Imported here so print-only runs never load http.client, ssl and json.
+    from .notify import send_notification
+
+    q = queue.Queue(maxsize=_NOTIFY_QUEUE_SIZE)
+    threading.Thread(
+        target=_notify_worker, args=(q, send_notification), name="digbuster-notify", daemon=True
+    ).start()
+    return q
 
 
 def watch():
@@ -60,73 +347,63 @@ def watch():
     cooldown = int(cfg["general"].get("cooldown_seconds", 60))
 
     domains_path = DEFAULT_DOMAINS
-    rules, rules_mtime = _load_rules(domains_path)
+    rules, rules_sig = _load_rules(domains_path)
 
     print(
         "[digbuster] watching "
         f"{logfile} (cooldown={cooldown}s, "
-        f"contains={len(rules['contains'])}, exact={len(rules['exact'])}, wildcards={len(rules['wildcards'])})"
+        f"contains={len(rules.contains)}, exact={len(rules.exact)}, wildcards={len(rules.wildcards)})"
     )
 
-    last_seen = {}
+    notify_q = _start_notifier() if cfg["notification"]["enabled"] else None
+
+    matcher = _Matcher(rules, cooldown)
     last_rules_check = 0.0
     rules_check_interval = 1.0
 
-    for raw in _tail_f(logfile):
+    for raw in _tail_f(logfile, also_watch=(domains_path,)):
         now_ts = time.time()
-        if now_ts - last_rules_check >= rules_check_interval:
+        if raw is None or now_ts - last_rules_check >= rules_check_interval:
             last_rules_check = now_ts
             try:
-                p = Path(domains_path)
-                current_mtime = p.stat().st_mtime if p.exists() else 0
-                if current_mtime and current_mtime != rules_mtime:
-                    new_rules, new_mtime = _load_rules(domains_path)
+                current_sig = _file_sig(domains_path)
+                if current_sig is not None and current_sig != rules_sig:
+                    new_rules, new_sig = _load_rules(domains_path)
                     rules = new_rules
-                    rules_mtime = new_mtime
+                    rules_sig = new_sig
+                    matcher.set_rules(rules)
                     print(
                         f"[digbuster] domains reloaded "
-                        f"(contains={len(rules['contains'])}, exact={len(rules['exact'])}, wildcards={len(rules['wildcards'])})"
+                        f"(contains={len(rules.contains)}, exact={len(rules.exact)}, wildcards={len(rules.wildcards)})"
                     )
             except Exception as e:
                 print(f"[digbuster] domains reload warning: {e}")
 
-        line = raw.rstrip("\n")
-        if not line:
+        if raw is None:
             continue
 
-        fqdns = extract_fqdns(line)
-        if not fqdns:
+        raw = raw.rstrip(b"\r")
+        if not raw:
             continue
 
-        now = time.time()
-        for fq in fqdns:
-            prev = last_seen.get(fq, 0.0)
-            if now - prev < cooldown:
-                continue
-
-            res = classify_fqdn(fq, rules)
-            if not res["hit"]:
-                continue
-
-            last_seen[fq] = now
-
-            reasons = []
-            if res["exact"]:
-                reasons.append("exact")
-            if res["wildcard"]:
-                reasons.append(f"wildcard(*.{res['wildcard']})")
-            if res["contains"]:
-                reasons.append("contains:" + ",".join(sorted(res["contains"])))
-            reason = "|".join(reasons) if reasons else "match"
+        matches = matcher.process_line(raw, time.time())
+        if not matches:
+            continue
 
-            print(f"[MATCH] {fq} -> {reason}")
-            print(f"        {line}")
+        line = raw.decode("utf-8", errors="replace")
+        # Collect all output for the line and emit it with a single write.
+        out = []
+        for fq, reason in matches:
+            out.append(f"[MATCH] {fq} -> {reason}\n        {line}\n")
 
-            title = f"DigBuster: {fq}"
-            msg = f"{reason}\n{line[:400]}"
-            ok, status = send_notification(cfg, title, msg, priority=0)
-            if not ok and status not in ("disabled",):
-                print(f"[digbuster] notify error: {status}")
+            if notify_q is not None:
+                title = f"DigBuster: {fq}"
+                msg = f"{reason}\n{line[:400]}"
+                try:
+                    notify_q.put_nowait((cfg, title, msg))
+                except queue.Full:
+                    out.append(f"[digbuster] notify queue full, dropping alert for {fq}\n")
+        sys.stdout.write("".join(out))
 
 def main():
     try:
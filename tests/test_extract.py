@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from digbuster import extract
+
+
+def _extract(line: bytes):
+    return extract.extract_fqdns(extract.lower_line(line))
+
+
+def test_overlong_label_keeps_shorter_match():
+    assert _extract(b"x c.d." + b"e" * 64) == {"c.d"}
+
+
+def test_overlong_label_does_not_hide_later_matches():
+    assert _extract(b"x c.d." + b"e" * 64 + b".f.g") == {"c.d", "f.g"}
+
+
+def test_non_ascii_word_is_not_split():
+    assert _extract("query münchen.de A".encode("utf-8")) == set()
+    assert _extract("query a.b.münchen A".encode("utf-8")) == set()
+    assert _extract("query münchen.de api.google.com A".encode("utf-8")) == {"api.google.com"}
+
+
+@pytest.mark.skipif(extract._HS_DB is None, reason="hyperscan not installed")
+def test_hyperscan_matches_regex():
+    rng = random.Random(0)
+    for _ in range(20000):
+        parts = []
+        for _ in range(rng.randint(0, 12)):
+            if rng.random() < 0.05:
+                parts.append("e" * rng.randint(60, 70))
+            else:
+                parts.append("".join(rng.choice("abZ09_-. :,ü") for _ in range(rng.randint(1, 5))))
+        data = extract.lower_line("".join(parts).encode("utf-8"))
+        assert extract._extract_hs(data) == extract._extract_re(data), data
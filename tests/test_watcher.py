@@ -0,0 +1,59 @@
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from digbuster import watcher
+
+pytestmark = pytest.mark.skipif(watcher.INotify is None, reason="inotify_simple not installed")
+
+# Well under watcher._INOTIFY_SAFETY_MS, so only a real inotify event can deliver in time.
+_DEADLINE = 1.5
+
+
+def _tail_in_thread(path, also_watch=()):
+    out = queue.Queue()
+
+    def run():
+        for item in watcher._tail_f(path, also_watch=also_watch):
+            out.put(item)
+
+    threading.Thread(target=run, daemon=True).start()
+    time.sleep(0.3)  # let the tailer open the file and set up its watches
+    return out
+
+
+def _make_symlinked(tmp_path, name):
+    real_dir = tmp_path / "real"
+    link_dir = tmp_path / "link"
+    real_dir.mkdir()
+    link_dir.mkdir()
+    target = real_dir / name
+    target.write_bytes(b"")
+    link = link_dir / name
+    os.symlink(target, link)
+    return target, link
+
+
+def test_symlinked_log_wakes_on_write(tmp_path):
+    target, link = _make_symlinked(tmp_path, "unbound.log")
+    out = _tail_in_thread(str(link))
+
+    with open(target, "ab") as f:
+        f.write(b"query: api.google.com A\n")
+
+    assert out.get(timeout=_DEADLINE) == b"query: api.google.com A"
+
+
+def test_symlinked_domains_triggers_reload(tmp_path):
+    log = tmp_path / "dns.log"
+    log.write_bytes(b"")
+    target, link = _make_symlinked(tmp_path, "domains.cfg")
+    out = _tail_in_thread(str(log), also_watch=(str(link),))
+
+    with open(target, "a") as f:
+        f.write("[exact]\nfoo.bar.net\n")
+
+    assert out.get(timeout=_DEADLINE) is None